@@ -1,6 +1,6 @@
 """Gyt CLI entry point."""
 
-from gyt.cli import app
+from gyt.cli import main
 
 if __name__ == "__main__":
-    app()
+    main()
@@ -1,17 +1,93 @@
 """CLI commands for gyt."""
 
+import argparse
+import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-import typer
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
 from .models import Repository, Milestone, Commit
 
-app = typer.Typer()
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.style import Style
+    from rich.text import Text
+
+# A line of output is a sequence of segments: plain strings or
+# (text, style name) pairs, with names resolved through _styles()
+_Segment = Union[str, Tuple[str, str]]
+_Line = Sequence[_Segment]
+
+
+@lru_cache(maxsize=None)
+def _console() -> "Console":
+    """Create the shared Rich console on first use."""
+    from rich.console import Console
+    return Console()
+
+
+def _use_rich() -> bool:
+    """Whether output goes through Rich rather than plain writes."""
+    return sys.stdout.isatty() or "FORCE_COLOR" in os.environ
+
+
+@lru_cache(maxsize=None)
+def _styles() -> Dict[str, "Style"]:
+    """Build the Rich styles for per-line output on first use.
+
+    Styled Text avoids markup parsing in hot loops.
+    """
+    from rich.style import Style
+    return {
+        "green": Style(color="green"),
+        "cyan": Style(color="cyan"),
+        "yellow": Style(color="yellow"),
+        "dim": Style(dim=True),
+    }
+
+
+def _to_text(lines: Sequence[_Line]) -> "Text":
+    """Assemble output lines into a single styled Rich Text."""
+    from rich.text import Text
+    styles = _styles()
+    return Text("\n").join([
+        Text.assemble(*[seg if isinstance(seg, str) else (seg[0], styles[seg[1]]) for seg in line])
+        for line in lines
+    ])
+
+
+def _emit(lines: Sequence[_Line]):
+    """Print output lines, without touching Rich when not on a terminal."""
+    if _use_rich():
+        _console().print(_to_text(lines))
+    else:
+        sys.stdout.write("\n".join(
+            "".join(seg if isinstance(seg, str) else seg[0] for seg in line) for line in lines
+        ) + "\n")
+
+
+def _lookup(cfg: dict, path: Tuple[str, ...]) -> Any:
+    """Walk a nested config along path, returning None if any key is missing."""
+    try:
+        for k in path:
+            cfg = cfg[k]
+    except (KeyError, TypeError):
+        return None
+    return cfg
+
+
+def _remote_url(cfg: dict) -> str:
+    """Return the configured remote.url, or an empty string."""
+    return cfg.get("remote", {}).get("url", "")
+
+
+def _format_timestamp(iso: str) -> str:
+    """Render an ISO timestamp as 'YYYY-MM-DD HH:MM:SS'."""
+    if len(iso) >= 19 and iso[10] == "T":
+        return f"{iso[:10]} {iso[11:19]}"
+    return datetime.fromisoformat(iso).strftime("%Y-%m-%d %H:%M:%S")
 
 
 def get_repo() -> Repository:
@@ -19,192 +95,246 @@ def get_repo() -> Repository:
     return Repository(Path.cwd())
 
 
-def ensure_repo() -> Repository:
+def ensure_repo(repo: Repository) -> Repository:
     """Ensure we're in a gyt repository."""
-    repo = get_repo()
     if not repo.is_initialized():
-        console.print("[red]Not a gyt repository. Run 'gyt init' first.[/red]")
-        raise typer.Exit(1)
+        _console().print("[red]Not a gyt repository. Run 'gyt init' first.[/red]")
+        raise SystemExit(1)
     return repo
 
 
-@app.command()
-def init():
+def init(repo: Repository, args: argparse.Namespace):
     """Initialize a new gyt repository in the current directory."""
-    repo = get_repo()
     if repo.init():
-        console.print("[green]Initialized empty gyt repository in .gyt/[/green]")
-    else:
-        console.print("[yellow]Repository already initialized.[/yellow]")
-
-
-@app.command()
-def add(
-    message: Optional[str] = typer.Argument(None, help="Milestone message"),
-    all: bool = typer.Option(False, "--all", "-a", help="Add a default milestone for today")
-):
-    """Add a milestone to the staging area."""
-    repo = ensure_repo()
-
-    if all or message == ".":
-        # Simple default milestone
-        milestone = Milestone(message="Daily progress")
-    elif message:
-        milestone = Milestone(message=message)
+        _console().print("[green]Initialized empty gyt repository in .gyt/[/green]")
     else:
-        console.print("[red]Please provide a milestone message or use --all/-a[/red]")
-        raise typer.Exit(1)
+        _console().print("[yellow]Repository already initialized.[/yellow]")
 
-    repo.add_milestone(milestone)
-    console.print(f"[green]Added milestone:[/green] {milestone.message}")
 
+def add(repo: Repository, args: argparse.Namespace):
+    """Add one or more milestones to the staging area."""
+    ensure_repo(repo)
 
-@app.command()
-def commit(
-    message: str = typer.Option(..., "--message", "-m", help="Commit message"),
-):
+    messages: List[str] = args.messages
+    if args.all:
+        messages = ["."]
+    elif not messages:
+        _console().print("[red]Please provide a milestone message or use --all/-a[/red]")
+        raise SystemExit(1)
+
+    # "." stages the simple default milestone, like `git add .`
+    milestones = [Milestone(message="Daily progress" if m == "." else m) for m in messages]
+
+    repo.add_milestones(milestones)
+    _emit([(("Added milestone:", "green"), " ", milestone.message) for milestone in milestones])
+
+
+def commit(repo: Repository, args: argparse.Namespace):
     """Commit staged milestones."""
-    repo = ensure_repo()
+    ensure_repo(repo)
+    message: str = args.message
 
     staged = repo.get_staged_milestones()
     if not staged:
-        console.print("[yellow]No milestones staged. Use 'gyt add' first.[/yellow]")
-        raise typer.Exit(1)
+        _console().print("[yellow]No milestones staged. Use 'gyt add' first.[/yellow]")
+        raise SystemExit(1)
 
     commit = Commit(message=message, milestones=staged)
     repo.add_commit(commit)
     repo.clear_staging()
 
-    console.print(f"[green]Committed {len(staged)} milestone(s):[/green] {message}")
-    console.print(f"[dim]Commit hash: {commit.commit_hash}[/dim]")
+    _emit([
+        ((f"Committed {len(staged)} milestone(s):", "green"), " ", message),
+        ((f"Commit hash: {commit.commit_hash}", "dim"),),
+    ])
 
 
-@app.command()
-def status():
+def status(repo: Repository, args: argparse.Namespace):
     """Show the status of the repository."""
-    repo = ensure_repo()
+    ensure_repo(repo)
 
     staged = repo.get_staged_milestones()
 
-    console.print(Panel("[bold]Gyt Status[/bold]"))
-
+    # Build the whole report first so it is written in a single call
+    parts: List[_Line]
     if staged:
-        console.print("\n[green]Staged milestones:[/green]")
-        for i, milestone in enumerate(staged, 1):
-            console.print(f"  {i}. {milestone.message}")
+        parts = [(("\nStaged milestones:", "green"),)]
+        parts.extend((f"  {i}. {milestone.message}",) for i, milestone in enumerate(staged, 1))
     else:
-        console.print("\n[dim]No milestones staged[/dim]")
+        parts = [(("\nNo milestones staged", "dim"),)]
 
-    console.print(f"\n[dim]Use 'gyt add <message>' to stage milestones[/dim]")
-    console.print(f"[dim]Use 'gyt commit -m \"message\"' to commit staged milestones[/dim]")
+    parts.append((("\nUse 'gyt add <message>' to stage milestones", "dim"),))
+    parts.append((("Use 'gyt commit -m \"message\"' to commit staged milestones", "dim"),))
 
+    if _use_rich():
+        from rich.console import Group
+        from rich.panel import Panel
+        _console().print(Group(Panel("[bold]Gyt Status[/bold]"), _to_text(parts)))
+    else:
+        _emit([("Gyt Status",), *parts])
 
-@app.command()
-def log(
-    limit: int = typer.Option(10, "--limit", "-n", help="Number of commits to show")
-):
+
+def log(repo: Repository, args: argparse.Namespace):
     """Show commit history."""
-    repo = ensure_repo()
+    ensure_repo(repo)
 
-    commits = repo.get_commits()
+    commits = list(repo.iter_recent_commits(args.limit))
 
-    if not commits:
-        console.print("[yellow]No commits yet.[/yellow]")
+    if not commits and not repo.has_commits():
+        _console().print("[yellow]No commits yet.[/yellow]")
         return
 
-    # Show most recent first
-    for commit in reversed(commits[-limit:]):
-        console.print(f"\n[yellow]commit {commit.commit_hash}[/yellow]")
-        console.print(f"Date:   {commit.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        console.print(f"\n    {commit.message}\n")
+    # Commits come back most recent first; render them all in one call
+    parts: List[_Line] = []
+    for commit in commits:
+        parts.append(((f"\ncommit {commit.commit_hash}", "yellow"),))
+        parts.append((f"Date:   {_format_timestamp(commit.timestamp_iso)}",))
+        parts.append((f"\n    {commit.message}\n",))
 
         for milestone in commit.milestones:
-            console.print(f"    • {milestone.message}")
+            parts.append((f"    • {milestone.message}",))
+
+    _emit(parts)
 
 
-@app.command()
-def stats(
-    days: int = typer.Option(30, "--days", "-d", help="Number of days to show stats for")
-):
+def stats(repo: Repository, args: argparse.Namespace):
     """Show milestone statistics."""
-    repo = ensure_repo()
+    ensure_repo(repo)
+    days: int = args.days
 
-    commits = repo.get_commits()
+    # Calculate stats from the columnar summary, which stops at the cutoff.
+    # Naive ISO timestamps sort lexically, so the cutoff stays a string.
+    from datetime import timedelta
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    _, _, counts = repo.get_commits_summary(since=cutoff)
 
-    if not commits:
-        console.print("[yellow]No commits yet.[/yellow]")
+    if not counts and not repo.has_commits():
+        _console().print("[yellow]No commits yet.[/yellow]")
         return
 
-    # Calculate stats
-    from datetime import timedelta
-    cutoff = datetime.now() - timedelta(days=days)
-    recent_commits = [c for c in commits if c.timestamp >= cutoff]
+    total_commits = len(counts)
+    total_milestones = sum(counts)
 
-    total_milestones = sum(len(c.milestones) for c in recent_commits)
+    from rich.table import Table
+    from rich.text import Text
 
-    table = Table(title=f"Stats for last {days} days")
-    table.add_column("Metric", style="cyan")
-    table.add_column("Value", style="green")
+    table = Table(
+        title=f"Stats for last {days} days",
+        show_lines=False,
+        expand=False,
+        padding=(0, 1),
+    )
+    table.add_column("Metric")
+    table.add_column("Value")
 
-    table.add_row("Total Commits", str(len(recent_commits)))
-    table.add_row("Total Milestones", str(total_milestones))
-    if recent_commits:
-        table.add_row("Avg Milestones/Commit", f"{total_milestones/len(recent_commits):.1f}")
+    rows = [("Total Commits", str(total_commits)), ("Total Milestones", str(total_milestones))]
+    if total_commits:
+        rows.append(("Avg Milestones/Commit", f"{total_milestones/total_commits:.1f}"))
+    styles = _styles()
+    for metric, value in rows:
+        table.add_row(Text(metric, style=styles["cyan"]), Text(value, style=styles["green"]))
 
-    console.print(table)
+    _console().print(table)
 
 
-@app.command()
-def config(
-    key: Optional[str] = typer.Argument(None, help="Config key (e.g., user.name)"),
-    value: Optional[str] = typer.Argument(None, help="Config value"),
-):
+def config(repo: Repository, args: argparse.Namespace):
     """Get or set configuration values."""
-    repo = ensure_repo()
+    ensure_repo(repo)
+    key: Optional[str] = args.key
+    value: Optional[str] = args.value
 
     if key and value:
         repo.set_config(key, value)
-        console.print(f"[green]Set {key} = {value}[/green]")
+        _console().print(f"[green]Set {key} = {value}[/green]")
     elif key:
-        config = repo.get_config()
-        keys = key.split(".")
-        current = config
-        for k in keys:
-            current = current.get(k, {})
-        console.print(f"{key} = {current}")
+        current = _lookup(repo.get_config(), tuple(key.split(".")))
+        if current is None:
+            _console().print(f"[yellow]{key} is not set[/yellow]")
+        else:
+            _console().print(f"{key} = {current}")
     else:
         import json
         config = repo.get_config()
-        console.print(json.dumps(config, indent=2))
+        _console().print(json.dumps(config, indent=2))
 
 
-@app.command()
-def push(
-    remote: Optional[str] = typer.Option(None, "--remote", help="Remote URL to push to")
-):
+def push(repo: Repository, args: argparse.Namespace):
     """Push commits to remote (gythub)."""
-    repo = ensure_repo()
+    ensure_repo(repo)
 
-    config = repo.get_config()
-    remote_url = remote or config.get("remote", {}).get("url", "")
+    remote_url = args.remote or _remote_url(repo.get_config())
 
     if not remote_url:
-        console.print("[red]No remote configured. Use 'gyt config remote.url <url>' first.[/red]")
-        raise typer.Exit(1)
+        _console().print("[red]No remote configured. Use 'gyt config remote.url <url>' first.[/red]")
+        raise SystemExit(1)
 
     commits = repo.get_commits()
 
     if not commits:
-        console.print("[yellow]No commits to push.[/yellow]")
+        _console().print("[yellow]No commits to push.[/yellow]")
         return
 
     # TODO: Implement actual API call to gythub server
-    console.print(f"[yellow]Pushing {len(commits)} commit(s) to {remote_url}...[/yellow]")
-    console.print("[dim]Note: Remote push not yet implemented. This will sync to gythub when available.[/dim]")
+    _console().print(f"[yellow]Pushing {len(commits)} commit(s) to {remote_url}...[/yellow]")
+    _console().print("[dim]Note: Remote push not yet implemented. This will sync to gythub when available.[/dim]")
 
     # Placeholder for future implementation:
     # import requests
     # response = requests.post(f"{remote_url}/api/push", json={
     #     "commits": [c.to_dict() for c in commits],
-    #     "user": config.get("user", {})
+    #     "user": repo.get_config().get("user", {})
     # })
+
+
+DISPATCH: Dict[str, Callable[[Repository, argparse.Namespace], None]] = {
+    "init": init,
+    "add": add,
+    "commit": commit,
+    "status": status,
+    "log": log,
+    "stats": stats,
+    "config": config,
+    "push": push,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for every gyt command."""
+    parser = argparse.ArgumentParser(prog="gyt", description="Gyt - Git-like daily milestone tracker.")
+    sub = parser.add_subparsers(dest="cmd", metavar="COMMAND", required=True)
+
+    def command(name: str) -> argparse.ArgumentParser:
+        summary = DISPATCH[name].__doc__
+        return sub.add_parser(name, help=summary, description=summary)
+
+    command("init")
+
+    p = command("add")
+    p.add_argument("messages", nargs="*", metavar="MESSAGE", help="Milestone message(s)")
+    p.add_argument("-a", "--all", action="store_true", help="Add a default milestone for today")
+
+    p = command("commit")
+    p.add_argument("-m", "--message", required=True, help="Commit message")
+
+    command("status")
+
+    p = command("log")
+    p.add_argument("-n", "--limit", type=int, default=10, help="Number of commits to show (0 for all)")
+
+    p = command("stats")
+    p.add_argument("-d", "--days", type=int, default=30, help="Number of days to show stats for")
+
+    p = command("config")
+    p.add_argument("key", nargs="?", help="Config key (e.g., user.name)")
+    p.add_argument("value", nargs="?", help="Config value")
+
+    p = command("push")
+    p.add_argument("--remote", help="Remote URL to push to")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the gyt command line."""
+    args = build_parser().parse_args(argv)
+    DISPATCH[args.cmd](get_repo(), args)
@@ -1,13 +1,99 @@
 """Data models for gyt."""
 
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from pathlib import Path
+import hashlib
 import json
+import mmap
+import os
+import sys
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-@dataclass
+
+_fromisoformat = datetime.fromisoformat
+
+_DEFAULT_CONFIG_BYTES = (
+    b'{\n'
+    b'  "user": {\n'
+    b'    "name": "",\n'
+    b'    "email": ""\n'
+    b'  },\n'
+    b'  "remote": {\n'
+    b'    "url": ""\n'
+    b'  }\n'
+    b'}\n'
+)
+
+# Slotted dataclasses drop the per-instance __dict__; only available on 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _json_default(obj):
+    """Encode milestones for the stdlib json fallback."""
+    if isinstance(obj, Milestone):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when available.
+
+    Milestone instances may be passed directly: orjson encodes dataclasses
+    and datetimes natively, matching the to_dict() layout. Commit keeps its
+    timestamp in private fields that orjson would skip, so it is rejected
+    here and must be serialized through to_dict().
+    """
+    if isinstance(obj, Commit):
+        raise TypeError("Commit must be serialized via to_dict()")
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, default=_json_default).encode()
+
+
+def _loads(buf: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+def _map_file(path: Path) -> Optional[mmap.mmap]:
+    """Memory-map a file read-only, or return None if it is empty."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return None
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _iter_lines_reversed(path: Path) -> Iterator[bytes]:
+    """Yield the non-empty lines of a file from last to first.
+
+    The file is memory-mapped and walked backwards from EOF, so the kernel
+    only pages in the tail that is actually consumed.
+    """
+    mm = _map_file(path)
+    if mm is None:
+        return
+    with mm:
+        end = len(mm)
+        while end > 0:
+            start = mm.rfind(b"\n", 0, end) + 1
+            line = mm[start:end]
+            if line.strip():
+                yield line
+            end = start - 1
+
+
+@dataclass(**_SLOTS)
 class Milestone:
     """A single milestone entry."""
     message: str
@@ -23,37 +109,67 @@ class Milestone:
 
     @classmethod
     def from_dict(cls, data: dict) -> "Milestone":
-        return cls(
-            message=data["message"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
-            tags=data.get("tags", [])
-        )
+        return cls(data["message"], _fromisoformat(data["timestamp"]), data.get("tags", []))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Commit:
-    """A commit containing one or more milestones."""
+    """A commit containing one or more milestones.
+
+    Commits loaded from disk keep the ISO string they were stored with and
+    only parse it into a datetime the first time `timestamp` is accessed.
+    """
     message: str
     milestones: List[Milestone]
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: InitVar[Optional[datetime]] = None
     commit_hash: Optional[str] = None
+    _timestamp_str: str = field(default="", init=False, repr=False)
+    _timestamp: Optional[datetime] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self, timestamp: Optional[datetime]):
+        if timestamp is None:
+            timestamp = datetime.now()
+        self._timestamp = timestamp
+        self._timestamp_str = timestamp.isoformat()
+
+    def _get_timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = _fromisoformat(self._timestamp_str)
+        return self._timestamp
+
+    def _set_timestamp(self, value: datetime):
+        self._timestamp = value
+        self._timestamp_str = value.isoformat()
+
+    @property
+    def timestamp_iso(self) -> str:
+        """The timestamp in ISO 8601 form, without parsing it."""
+        return self._timestamp_str
 
     def to_dict(self) -> dict:
         return {
             "message": self.message,
             "milestones": [m.to_dict() for m in self.milestones],
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self._timestamp_str,
             "commit_hash": self.commit_hash
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Commit":
-        return cls(
-            message=data["message"],
-            milestones=[Milestone.from_dict(m) for m in data["milestones"]],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
-            commit_hash=data.get("commit_hash")
-        )
+        # Bypass __init__ so the stored ISO string is kept unparsed
+        milestone_from_dict = Milestone.from_dict
+        commit = cls.__new__(cls)
+        commit.message = data["message"]
+        commit.milestones = [milestone_from_dict(m) for m in data["milestones"]]
+        commit.commit_hash = data.get("commit_hash")
+        commit._timestamp_str = data["timestamp"]
+        commit._timestamp = None
+        return commit
+
+
+# Installed after the dataclass is built, since the class attribute named
+# `timestamp` supplies the default for the InitVar of the same name
+Commit.timestamp = property(Commit._get_timestamp, Commit._set_timestamp)
 
 
 class Repository:
@@ -62,74 +178,159 @@ class Repository:
     def __init__(self, repo_path: Path):
         self.repo_path = repo_path
         self.gyt_dir = repo_path / ".gyt"
-        self.staging_file = self.gyt_dir / "staging.json"
-        self.commits_file = self.gyt_dir / "commits.json"
+        self.staging_file = self.gyt_dir / "staging.jsonl"
+        self.legacy_staging_file = self.gyt_dir / "staging.json"
+        self.commits_file = self.gyt_dir / "commits.jsonl"
+        self.legacy_commits_file = self.gyt_dir / "commits.json"
         self.config_file = self.gyt_dir / "config.json"
 
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        """Replace path with data so readers never see a partial file."""
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _create_file(path: Path, data: bytes = b""):
+        """Create a new file holding data; fails if it already exists."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            if data:
+                os.write(fd, data)
+        finally:
+            os.close(fd)
+
     def init(self) -> bool:
         """Initialize a new gyt repository."""
-        if self.gyt_dir.exists():
+        try:
+            self.gyt_dir.mkdir(parents=True)
+        except FileExistsError:
             return False
 
-        self.gyt_dir.mkdir(parents=True)
-        self.staging_file.write_text("[]")
-        self.commits_file.write_text("[]")
-        self.config_file.write_text(json.dumps({
-            "user": {
-                "name": "",
-                "email": ""
-            },
-            "remote": {
-                "url": ""
-            }
-        }, indent=2))
+        self._create_file(self.staging_file)
+        self._create_file(self.commits_file)
+        self._create_file(self.config_file, _DEFAULT_CONFIG_BYTES)
         return True
 
     def is_initialized(self) -> bool:
         """Check if current directory is a gyt repository."""
         return self.gyt_dir.exists()
 
+    def _migrate_legacy(self, legacy: Path, path: Path):
+        """Convert a legacy JSON array file into its JSONL replacement."""
+        if path.exists() or not legacy.exists():
+            return
+        data = _loads(legacy.read_bytes())
+        self._atomic_write(path, b"".join(_dumps(item) + b"\n" for item in data))
+        legacy.unlink()
+
     def get_staged_milestones(self) -> List[Milestone]:
         """Get currently staged milestones."""
+        self._migrate_legacy(self.legacy_staging_file, self.staging_file)
         if not self.staging_file.exists():
             return []
-        data = json.loads(self.staging_file.read_text())
-        return [Milestone.from_dict(m) for m in data]
+        return self._read_staging(self.staging_file)
+
+    @staticmethod
+    def _read_staging(path: Path) -> List[Milestone]:
+        with open(path, "rb") as f:
+            return [Milestone.from_dict(_loads(line)) for line in f if line.strip()]
 
     def add_milestone(self, milestone: Milestone):
-        """Add a milestone to staging area."""
-        staged = self.get_staged_milestones()
-        staged.append(milestone)
-        self.staging_file.write_text(json.dumps([m.to_dict() for m in staged], indent=2))
+        """Append a milestone to the staging area."""
+        self.add_milestones([milestone])
+
+    def add_milestones(self, milestones: List[Milestone]):
+        """Append several milestones to the staging area in one write."""
+        self._migrate_legacy(self.legacy_staging_file, self.staging_file)
+        with open(self.staging_file, "ab") as f:
+            f.write(b"".join(_dumps(m) + b"\n" for m in milestones))
 
     def clear_staging(self):
         """Clear the staging area."""
-        self.staging_file.write_text("[]")
+        if self.legacy_staging_file.exists():
+            self.legacy_staging_file.unlink()
+        if self.staging_file.exists():
+            os.truncate(self.staging_file, 0)
 
     def get_commits(self) -> List[Commit]:
         """Get all commits."""
+        self._migrate_legacy(self.legacy_commits_file, self.commits_file)
         if not self.commits_file.exists():
             return []
-        data = json.loads(self.commits_file.read_text())
-        return [Commit.from_dict(c) for c in data]
+        return self._read_commits(self.commits_file)
+
+    @staticmethod
+    def _read_commits(path: Path) -> List[Commit]:
+        with open(path, "rb") as f:
+            return [Commit.from_dict(_loads(line)) for line in f if line.strip()]
+
+    def iter_recent_commits(self, n: Optional[int] = None) -> Iterator[Commit]:
+        """Yield commits newest first, stopping after `n` if it is positive."""
+        self._migrate_legacy(self.legacy_commits_file, self.commits_file)
+        if not self.commits_file.exists():
+            return
+        for i, line in enumerate(_iter_lines_reversed(self.commits_file), 1):
+            yield Commit.from_dict(_loads(line))
+            if i == n:
+                return
+
+    def has_commits(self) -> bool:
+        """Check whether any commit has been recorded."""
+        self._migrate_legacy(self.legacy_commits_file, self.commits_file)
+        return self.commits_file.exists() and self.commits_file.stat().st_size > 0
+
+    def get_commits_summary(
+        self, since: Optional[str] = None
+    ) -> Tuple[List[str], List[str], List[int]]:
+        """Get commit messages, ISO timestamps and milestone counts, newest first.
+
+        Columns are read straight from the parsed JSON without building
+        Commit or Milestone objects. If `since` is an ISO timestamp, the scan
+        stops at the first commit older than it.
+        """
+        messages: List[str] = []
+        timestamps: List[str] = []
+        counts: List[int] = []
+        self._migrate_legacy(self.legacy_commits_file, self.commits_file)
+        if not self.commits_file.exists():
+            return messages, timestamps, counts
+        for line in _iter_lines_reversed(self.commits_file):
+            data = _loads(line)
+            timestamp = data["timestamp"]
+            if since is not None and timestamp < since:
+                break
+            messages.append(data["message"])
+            timestamps.append(timestamp)
+            counts.append(len(data["milestones"]))
+        return messages, timestamps, counts
 
     def add_commit(self, commit: Commit):
-        """Add a new commit to history."""
-        commits = self.get_commits()
+        """Append a new commit to history."""
+        self._migrate_legacy(self.legacy_commits_file, self.commits_file)
 
-        # Generate simple hash from timestamp
-        import hashlib
-        hash_input = f"{commit.timestamp.isoformat()}{commit.message}"
-        commit.commit_hash = hashlib.sha256(hash_input.encode()).hexdigest()[:8]
+        # Generate simple hash from timestamp and message
+        h = hashlib.blake2b(digest_size=4)
+        h.update(commit.timestamp_iso.encode())
+        h.update(commit.message.encode())
+        commit.commit_hash = h.hexdigest()
 
-        commits.append(commit)
-        self.commits_file.write_text(json.dumps([c.to_dict() for c in commits], indent=2))
+        with open(self.commits_file, "ab") as f:
+            f.write(_dumps(commit.to_dict()) + b"\n")
 
     def get_config(self) -> dict:
         """Get repository configuration."""
         if not self.config_file.exists():
             return {}
-        return json.loads(self.config_file.read_text())
+        return _loads(self.config_file.read_bytes())
 
     def set_config(self, key: str, value: str):
         """Set a configuration value."""
@@ -141,4 +342,4 @@ class Repository:
                 current[k] = {}
             current = current[k]
         current[keys[-1]] = value
-        self.config_file.write_text(json.dumps(config, indent=2))
+        self._atomic_write(self.config_file, _dumps(config, indent=True) + b"\n")